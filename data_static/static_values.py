@@ -51,6 +51,10 @@ files = [
 for f in files:
     with rasterio.open(f) as src:
         data = src.read(1)
+        # Quantized outputs carry scale/offset, float outputs have 1/0
+        if src.scales[0] != 1.0 or src.offsets[0] != 0.0:
+            data = src.read(1, masked=True).astype(np.float32)
+            data = (data * src.scales[0] + src.offsets[0]).filled(np.nan)
 
     print(f)
     print("  Min:", np.nanmin(data))
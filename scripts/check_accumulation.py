@@ -0,0 +1,80 @@
+"""
+Offline check of risk.RainAccumulator.
+
+Feeds a few random hourly rasters (with NaN) through the accumulator and
+compares every hour with a brute-force sum over each window, long enough
+for every window to roll over. A second run leaves out two hours and checks
+they count as 0 mm, and that hours out of order are rejected.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from risk import ACCUMULATION_WINDOWS, RainAccumulator, rain_file_time
+
+SHAPE = (20, 30)
+START = datetime(2026, 2, 6, 0)
+
+
+def brute_force_factor(rain_by_hour, hour):
+    """Rain factor at hour from the full history, no running sums"""
+    factor = np.zeros(SHAPE)
+    for hours, saturation in ACCUMULATION_WINDOWS.items():
+        total = sum(rain_by_hour.get(h, 0) for h in range(hour - hours + 1, hour + 1))
+        factor = np.maximum(factor, np.clip(total / saturation, 0, 1))
+
+    return factor
+
+
+def random_rain(rng):
+    rain = rng.gamma(0.8, 12.0, SHAPE).astype(np.float32)
+    rain[rng.random(SHAPE) < 0.05] = np.nan
+    return rain
+
+
+def run(rain_by_hour, hours):
+    accumulator = RainAccumulator()
+    worst = 0.0
+
+    for hour in hours:
+        time = rain_file_time(f"rain_{(START + timedelta(hours=hour)):%Y%m%d_%H}.tif")
+        factor = accumulator.update(rain_by_hour[hour], time)
+
+        assert factor.dtype == np.float32
+        expected = brute_force_factor(
+            {h: np.nan_to_num(rain_by_hour[h]) for h in hours if h <= hour}, hour)
+        worst = max(worst, np.abs(factor - expected).max())
+
+    # float32 output of float64 sums
+    assert worst < 1e-6, worst
+    return worst
+
+
+def main():
+    rng = np.random.default_rng(0)
+    last = 3 * max(ACCUMULATION_WINDOWS) + 3
+    rain_by_hour = {hour: random_rain(rng) for hour in range(last)}
+
+    worst = run(rain_by_hour, list(range(last)))
+    print(f"   {last} consecutive hours: max error {worst:.1e}")
+
+    # Gaps of one hour and of longer than every window
+    hours = [h for h in range(last) if h != 4 and not 9 <= h < 9 + max(ACCUMULATION_WINDOWS)]
+    worst = run(rain_by_hour, hours)
+    print(f"   {len(hours)} hours with gaps: max error {worst:.1e}")
+
+    accumulator = RainAccumulator()
+    accumulator.update(rain_by_hour[0], rain_file_time("rain_20260206_05.tif"))
+    try:
+        accumulator.update(rain_by_hour[1], rain_file_time("rain_20260206_05.tif"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("repeated hour was accepted")
+
+    print("Accumulation check passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 import os
-import rasterio
 import numpy as np
 
+from quantize import read_eta_raster
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-os.chdir(BASE_DIR)
 
-with rasterio.open("data_dynamic_processed/eta_map.tif") as src:
-    data = src.read(1)
 
-print("Unique ETA values:", np.unique(data))
+def main():
+    os.chdir(BASE_DIR)
+
+    data = read_eta_raster("data_dynamic_processed/eta_map.tif")
+
+    print("Unique ETA values:", np.unique(data[~np.isnan(data)]))
+
+
+if __name__ == "__main__":
+    main()
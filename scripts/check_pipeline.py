@@ -0,0 +1,96 @@
+"""
+Offline check of pipeline.run_pipelined.
+
+Runs a stateful compute (the rain accumulator) over random hourly arrays
+once with a plain sequential loop and once pipelined, with stage delays so
+the threads really overlap, and checks the written results match. Then
+makes each stage fail in turn and checks the error reaches the caller.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from pipeline import run_pipelined
+from risk import RainAccumulator
+
+HOURS = 12
+DEPTH = 2
+
+
+class StageError(Exception):
+    pass
+
+
+def make_stages(rain_by_hour, fail=None):
+    """read/compute/write over rain_by_hour; fail names a stage that raises at hour 5"""
+    accumulator = RainAccumulator()
+    written = {}
+    lock = threading.Lock()
+    progress = {"computed": -1, "max_ahead": 0}
+
+    def read(hour):
+        time.sleep(0.002)
+        if fail == "read" and hour == 5:
+            raise StageError("read")
+        with lock:
+            progress["max_ahead"] = max(progress["max_ahead"], hour - progress["computed"] - 1)
+        return rain_by_hour[hour].copy()
+
+    def compute(hour, rain):
+        if fail == "compute" and hour == 5:
+            raise StageError("compute")
+        result = accumulator.update(rain)
+        with lock:
+            progress["computed"] = hour
+        return result
+
+    def write(hour, result):
+        # Later hours may finish first with several writers
+        time.sleep(0.004 if hour % 2 == 0 else 0.001)
+        if fail == "write" and hour == 5:
+            raise StageError("write")
+        with lock:
+            written[hour] = result
+
+    return read, compute, write, written, progress
+
+
+def main():
+    rng = np.random.default_rng(0)
+    rain_by_hour = [rng.gamma(0.8, 12.0, (40, 40)).astype(np.float32) for _ in range(HOURS)]
+
+    read, compute, write, expected, _ = make_stages(rain_by_hour)
+    for hour in range(HOURS):
+        write(hour, compute(hour, read(hour)))
+
+    read, compute, write, written, progress = make_stages(rain_by_hour)
+    run_pipelined(range(HOURS), read, compute, write, depth=DEPTH, writers=2)
+
+    assert sorted(written) == list(range(HOURS)), sorted(written)
+    for hour in range(HOURS):
+        assert np.array_equal(written[hour], expected[hour]), hour
+
+    # Reads never run more than depth hours ahead of compute
+    assert progress["max_ahead"] <= DEPTH, progress["max_ahead"]
+    print(f"   pipelined output matches the sequential loop ({HOURS} hours)")
+
+    for stage in ("read", "compute", "write"):
+        read, compute, write, written, _ = make_stages(rain_by_hour, fail=stage)
+        try:
+            run_pipelined(range(HOURS), read, compute, write, depth=DEPTH, writers=2)
+        except StageError as error:
+            assert str(error) == stage
+        else:
+            raise AssertionError(f"{stage} error was not raised")
+
+        # The run stops near the failure instead of finishing every hour
+        assert len(written) < HOURS, (stage, sorted(written))
+        print(f"   {stage} error raised after {len(written)} hours written")
+
+    print("Pipeline check passed.")
+
+
+if __name__ == "__main__":
+    main()
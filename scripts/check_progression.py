@@ -1,10 +1,10 @@
 import os
-import rasterio
 import numpy as np
 
-# Move to project root
+from quantize import read_unit_raster
+
+# Project root
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-os.chdir(BASE_DIR)
 
 files = [
     "data_dynamic_processed/dynamic_risk/dyn_12.tif",
@@ -12,7 +12,15 @@ files = [
     "data_dynamic_processed/dynamic_risk/dyn_14.tif"
 ]
 
-for f in files:
-    with rasterio.open(f) as src:
-        data = src.read(1)
-    print(f, "Max:", np.nanmax(data))
+
+def main():
+    # Move to project root
+    os.chdir(BASE_DIR)
+
+    for f in files:
+        data = read_unit_raster(f)
+        print(f, "Max:", np.nanmax(data))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Offline check of quantize.py.
+
+Writes a NaN-containing [0, 1] array in every quantized dtype, reads it
+back and verifies the error stays within max_error(dtype) and NaN survives
+as NoData. Also checks the uint8 ETA NoData handling.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+
+from quantize import (
+    ETA_NODATA,
+    QUANT_DTYPES,
+    max_error,
+    read_eta_raster,
+    read_unit_raster,
+    write_eta_raster,
+    write_unit_raster,
+)
+
+META = {
+    "driver": "GTiff",
+    "height": 50,
+    "width": 40,
+    "count": 1,
+    "dtype": "float32",
+    "crs": "EPSG:26918",
+    "transform": from_origin(580000, 4510000, 10, 10),
+}
+
+
+def check_unit_round_trip(tmp):
+    rng = np.random.default_rng(0)
+    data = rng.random((META["height"], META["width"])).astype(np.float32)
+    data[0, 0], data[0, 1] = 0.0, 1.0
+    data[5:8, 5:8] = np.nan
+
+    for dtype in QUANT_DTYPES:
+        path = os.path.join(tmp, f"unit_{dtype}.tif")
+        write_unit_raster(path, data, META, quantize=dtype)
+
+        with rasterio.open(path) as src:
+            assert src.dtypes[0] == dtype, src.dtypes
+            assert src.nodata == QUANT_DTYPES[dtype], src.nodata
+
+        codes = read_unit_raster(path, dequantize_values=False)
+        assert (codes[5:8, 5:8] == QUANT_DTYPES[dtype]).all()
+
+        restored = read_unit_raster(path)
+        nan = np.isnan(data)
+        assert (np.isnan(restored) == nan).all()
+
+        error = np.abs(restored[~nan] - data[~nan]).max()
+        # float32 dequantization adds at most a few ulps on top of the bound
+        assert error <= max_error(dtype) + 1e-6, (dtype, error, max_error(dtype))
+
+        print(f"   {dtype}: max error {error:.7f} <= {max_error(dtype):.7f}")
+
+    # Float output stays as written
+    path = os.path.join(tmp, "unit_float.tif")
+    write_unit_raster(path, data, META)
+    restored = read_unit_raster(path)
+    assert restored.dtype == np.float32
+    assert np.array_equal(restored, data, equal_nan=True)
+
+
+def check_eta(tmp):
+    shape = (META["height"], META["width"])
+    eta_hours = np.zeros(shape, dtype=np.uint8)
+    reached = np.zeros(shape, dtype=bool)
+
+    # Hour 0 is a real hour and must not become NoData
+    eta_hours[:10], reached[:10] = 0, True
+    eta_hours[10:20], reached[10:20] = 13, True
+
+    path = os.path.join(tmp, "eta_quantized.tif")
+    write_eta_raster(path, eta_hours, reached, META, quantize=True)
+
+    with rasterio.open(path) as src:
+        assert src.dtypes[0] == "uint8"
+        assert src.nodata == ETA_NODATA
+        assert (src.read(1)[20:] == ETA_NODATA).all()
+
+    eta = read_eta_raster(path)
+    assert (eta[:10] == 0).all()
+    assert (eta[10:20] == 13).all()
+    assert np.isnan(eta[20:]).all()
+
+    # Float layout keeps 0 for cells that never reach the threshold
+    path = os.path.join(tmp, "eta_float.tif")
+    write_eta_raster(path, eta_hours, reached, META)
+    eta = read_eta_raster(path)
+    assert eta.dtype == np.float32
+    assert (eta[10:20] == 13).all() and (eta[20:] == 0).all()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        check_unit_round_trip(tmp)
+        check_eta(tmp)
+
+    print("Quantize check passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import rasterio
+
+from pipeline import pipeline_depth, run_pipelined
+from quantize import write_unit_raster
+from raster_cache import read_cached
+from risk import RainAccumulator, clean_static, compute_dynamic_risk, compute_rain_factor, rain_file_time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATIC = "data_static/static_fv_10m.tif"
+WETNESS = "data_dynamic_raw/soil/wf_20260206.tif"
+
+# None or "float32" keeps float32 output; "uint8" or "uint16" stores scaled integer codes
+# (see quantize.py for the precision bounds)
+QUANTIZE = None
+
+# True uses the accumulated-rainfall factor over risk.ACCUMULATION_WINDOWS
+# instead of normalizing each hour on its own
+ACCUMULATE = False
+
+# True overlaps reading, computing and writing hours (see pipeline.py)
+PIPELINE = False
+PIPELINE_MEMORY_MB = 512  # budget for prefetched and not yet written hours
+WRITERS = 2
+
+rain_folder = "data_dynamic_raw/rainfall"
+
+
+def main(quantize=None, accumulate=None, pipeline=None, memory_mb=None):
+    # Unset options fall back to the module settings, read at call time
+    quantize = QUANTIZE if quantize is None else quantize
+    accumulate = ACCUMULATE if accumulate is None else accumulate
+    pipeline = PIPELINE if pipeline is None else pipeline
+    memory_mb = PIPELINE_MEMORY_MB if memory_mb is None else memory_mb
+
+    os.chdir(BASE_DIR)
+
+    os.makedirs("data_dynamic_processed/rainfactor", exist_ok=True)
+    os.makedirs("data_dynamic_processed/dynamic_risk", exist_ok=True)
+
+    # Load static
+    static_fv, meta = read_cached(STATIC)
+
+    # Clean NoData
+    static_fv = clean_static(static_fv)
+
+    # Load soil
+    wetness, _ = read_cached(WETNESS)
+
+    accumulator = RainAccumulator() if accumulate else None
+
+    # Chronological order, the accumulated factor depends on it
+    rain_files = sorted(file for file in os.listdir(rain_folder) if file.endswith(".tif"))
+
+    def read_hour(file):
+        with rasterio.open(os.path.join(rain_folder, file)) as src:
+            return src.read(1)
+
+    def compute_hour(file, rainfall):
+        # Normalize rainfall
+        if accumulator is not None:
+            rain_factor = accumulator.update(rainfall, rain_file_time(file))
+        else:
+            rain_factor = compute_rain_factor(rainfall)
+
+        # Compute dynamic risk
+        dynamic_risk = compute_dynamic_risk(static_fv, rain_factor, wetness)
+
+        return rain_factor, dynamic_risk
+
+    def write_hour(file, result):
+        rain_factor, dynamic_risk = result
+        hour = file.split("_")[-1].replace(".tif", "")
+
+        # Save rainfactor
+        rf_path = f"data_dynamic_processed/rainfactor/rf_{hour}.tif"
+        dr_path = f"data_dynamic_processed/dynamic_risk/dyn_{hour}.tif"
+
+        write_unit_raster(rf_path, rain_factor, meta, quantize)
+        write_unit_raster(dr_path, dynamic_risk, meta, quantize)
+
+        print(f"Processed hour {hour}")
+
+    if pipeline:
+        depth = pipeline_depth(meta["height"], meta["width"], memory_mb)
+        run_pipelined(rain_files, read_hour, compute_hour, write_hour, depth=depth, writers=WRITERS)
+    else:
+        for file in rain_files:
+            write_hour(file, compute_hour(file, read_hour(file)))
+
+    print("Dynamic computation completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,9 @@ import os
 import rasterio
 import numpy as np
 
+from quantize import read_unit_raster, write_eta_raster
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-os.chdir(BASE_DIR)
 
 dynamic_files = [
     ("12", "data_dynamic_processed/dynamic_risk/dyn_12.tif"),
@@ -13,22 +14,34 @@ dynamic_files = [
 
 THRESHOLD = 0.4
 
-with rasterio.open(dynamic_files[0][1]) as src:
-    shape = src.shape
-    meta = src.meta.copy()
+# True stores uint8 hours with a real NoData value instead of float32
+QUANTIZE = False
+
+
+def main(quantize=None):
+    # Unset option falls back to the module setting, read at call time
+    quantize = QUANTIZE if quantize is None else quantize
+
+    os.chdir(BASE_DIR)
+
+    with rasterio.open(dynamic_files[0][1]) as src:
+        shape = src.shape
+        meta = src.meta.copy()
+
+    eta_map = np.zeros(shape, dtype=np.uint8)
+    reached = np.zeros(shape, dtype=bool)
 
-eta_map = np.zeros(shape)
+    for hour, file in dynamic_files:
+        data = read_unit_raster(file)
 
-for hour, file in dynamic_files:
-    with rasterio.open(file) as src:
-        data = src.read(1)
+        mask = (data >= THRESHOLD) & ~reached
+        eta_map[mask] = int(hour)
+        reached |= mask
 
-    mask = (data >= THRESHOLD) & (eta_map == 0)
-    eta_map[mask] = int(hour)
+    write_eta_raster("data_dynamic_processed/eta_map.tif", eta_map, reached, meta, quantize)
 
-meta.update(dtype=rasterio.float32)
+    print("ETA map created.")
 
-with rasterio.open("data_dynamic_processed/eta_map.tif", "w", **meta) as dst:
-    dst.write(eta_map.astype(np.float32), 1)
 
-print("ETA map created.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+One command for every pipeline stage.
+
+    flood-model dummy-data
+    flood-model dynamic --quantize uint8
+    flood-model eta
+    flood-model regions --region hudson=hudson_county.gpkg --region essex=essex.gpkg
+
+Only the standard library is imported here. A stage's module, and with it
+numpy, rasterio, geopandas, pandas or ee, is imported when that stage runs.
+
+For frequent short runs, start a warm worker once. It keeps GDAL, the
+static and wetness rasters and the stage modules loaded, and runs jobs
+one at a time:
+
+    flood-model worker
+    flood-model --worker ~/.flood-model/worker.sock dynamic
+                                        (or set FLOOD_MODEL_WORKER to the address)
+
+On POSIX the worker listens on a Unix socket that only its user can open
+(0600). Where Unix sockets are missing (Windows) it falls back to TCP on
+127.0.0.1, and every job must carry the token the worker writes to
+~/.flood-model/worker.token. The address is a socket path on POSIX and a
+port number on the TCP fallback.
+
+If the worker is not reachable the job runs locally instead.
+"""
+
+import argparse
+import contextlib
+import hmac
+import importlib
+import io
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import traceback
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPTS_DIR)
+
+RAIN_DIR = os.path.join("scripts", "rainfall_pipeline")
+SOIL_DIR = os.path.join("scripts", "soil_moisture_pipeline")
+STATIC_DIR = "data_static"
+
+WORKER_ENV = "FLOOD_MODEL_WORKER"
+WORKER_DIR = os.path.join(os.path.expanduser("~"), ".flood-model")
+TOKEN_FILE = os.path.join(WORKER_DIR, "worker.token")
+
+# Unix sockets where available, TCP on 127.0.0.1 with a token otherwise
+USE_UNIX_SOCKET = hasattr(socket, "AF_UNIX")
+DEFAULT_ADDRESS = os.path.join(WORKER_DIR, "worker.sock") if USE_UNIX_SOCKET else "8765"
+
+CONNECT_TIMEOUT = 5  # seconds; a job itself may run as long as it needs
+
+
+def load_stage(module, folder="scripts"):
+    """Import a stage module on demand from a folder of the project"""
+    path = os.path.join(BASE_DIR, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(module)
+
+
+def given(args, *names):
+    """
+    Options the user actually passed. Unset flags are None and are left out,
+    so the stage falls back to its own module settings.
+    """
+    return {name: getattr(args, name) for name in names if getattr(args, name) is not None}
+
+
+# =
+# STAGES
+# =
+
+def run_dummy_data(args):
+    load_stage("dummy_data").main()
+
+
+def run_resample(args):
+    os.chdir(BASE_DIR)
+    load_stage("resample_static", STATIC_DIR).main()
+
+
+def run_rain_fetch(args):
+    load_stage("fetch_rainfall", RAIN_DIR).main()
+
+
+def run_rain_raster(args):
+    load_stage("CSVtoRaster", RAIN_DIR).main()
+
+
+def run_soil(args):
+    os.chdir(BASE_DIR)
+    load_stage("soilmoisture", SOIL_DIR).main(**given(args, "download_mode"))
+
+
+def run_clip(args):
+    os.chdir(BASE_DIR)
+    load_stage("cliphudsonboundary", SOIL_DIR).main()
+
+
+def run_dynamic(args):
+    options = given(args, "quantize", "accumulate", "pipeline", "memory_mb")
+    load_stage("dynamic_core").main(**options)
+
+
+def run_eta(args):
+    load_stage("eta_calculation").main(**given(args, "quantize"))
+
+
+def run_regions(args):
+    multi_region = load_stage("multi_region")
+
+    regions = None
+    if args.region:
+        regions = {}
+        for item in args.region:
+            name, boundary_file = item.split("=", 1)
+
+            if not multi_region.valid_region_name(name):
+                raise SystemExit(f"Invalid region name: {name!r} (no path separators or '..')")
+
+            regions[name] = os.path.abspath(boundary_file)
+
+    options = given(args, "quantize", "quantize_eta", "download_soil", "accumulate")
+    multi_region.main(regions=regions, **options)
+
+
+def run_check_eta(args):
+    load_stage("check_eta").main()
+
+
+def run_check_progression(args):
+    load_stage("check_progression").main()
+
+
+# =
+# WORKER
+# =
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """Run one CLI job per connection and send back its output"""
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        output = io.StringIO()
+        ok = True
+
+        token = self.server.token
+        if token is not None and not hmac.compare_digest(str(request.get("token", "")), token):
+            self.wfile.write(json.dumps({"ok": False, "output": "Invalid worker token\n"}).encode() + b"\n")
+            return
+
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                os.chdir(request["cwd"])
+                args = build_parser().parse_args(request["argv"])
+
+                if args.func is run_worker:
+                    raise ValueError("A worker cannot start another worker")
+
+                args.func(args)
+            except SystemExit as e:
+                if e.code not in (None, 0):
+                    ok = False
+                    if not isinstance(e.code, int):
+                        print(e.code)
+            except Exception:
+                ok = False
+                traceback.print_exc()
+
+        reply = {"ok": ok, "output": output.getvalue()}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+def write_token():
+    """Create a fresh token readable only by the current user"""
+    os.makedirs(WORKER_DIR, mode=0o700, exist_ok=True)
+    token = secrets.token_hex(32)
+
+    if os.path.exists(TOKEN_FILE):
+        os.remove(TOKEN_FILE)
+
+    fd = os.open(TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+
+    return token
+
+
+def read_token():
+    with open(TOKEN_FILE) as f:
+        return f.read().strip()
+
+
+def make_server(address):
+    """Unix socket (0600) on POSIX, token-checked localhost TCP otherwise"""
+    if USE_UNIX_SOCKET:
+        os.makedirs(os.path.dirname(os.path.abspath(address)), mode=0o700, exist_ok=True)
+        if os.path.exists(address):
+            os.remove(address)
+
+        # The socket is created 0600, there is no window where others can connect
+        old_umask = os.umask(0o177)
+        try:
+            server = socketserver.UnixStreamServer(address, JobHandler)
+        finally:
+            os.umask(old_umask)
+
+        server.token = None
+        return server
+
+    server = socketserver.TCPServer(("127.0.0.1", int(address)), JobHandler)
+    server.token = write_token()
+    return server
+
+
+def run_worker(args):
+    import rasterio
+
+    cache = load_stage("raster_cache")
+    cache.enable_cache()
+    dynamic_core = load_stage("dynamic_core")
+    load_stage("eta_calculation")
+
+    address = os.path.expanduser(args.address)
+
+    # Drivers are registered once and stay registered for every job
+    with rasterio.Env():
+        os.chdir(BASE_DIR)
+
+        for path in (dynamic_core.STATIC, dynamic_core.WETNESS):
+            if os.path.exists(path):
+                cache.read_cached(path)
+                print(f"Cached {path}")
+
+        with make_server(address) as server:
+            print(f"Worker listening on {address}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                print("Worker stopped.")
+            finally:
+                if USE_UNIX_SOCKET and os.path.exists(address):
+                    os.remove(address)
+
+
+def connect(address):
+    if USE_UNIX_SOCKET:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(CONNECT_TIMEOUT)
+        try:
+            conn.connect(os.path.expanduser(address))
+        except OSError:
+            conn.close()
+            raise
+    else:
+        conn = socket.create_connection(("127.0.0.1", int(address)), timeout=CONNECT_TIMEOUT)
+
+    # Connected: the job may take as long as it needs
+    conn.settimeout(None)
+    return conn
+
+
+def submit(address, argv):
+    """
+    Send argv to a running worker, print its output, return the exit code.
+
+    Raises OSError when the worker cannot be reached, so the caller can run
+    the job locally instead.
+    """
+    request = {"cwd": os.getcwd(), "argv": argv}
+    if not USE_UNIX_SOCKET:
+        request["token"] = read_token()
+
+    with connect(address) as conn:
+        conn.sendall(json.dumps(request).encode() + b"\n")
+        line = conn.makefile().readline()
+
+    try:
+        reply = json.loads(line)
+    except ValueError:
+        print("Worker closed the connection without a valid reply; the job may not have finished",
+              file=sys.stderr)
+        return 1
+
+    sys.stdout.write(reply["output"])
+    return 0 if reply["ok"] else 1
+
+
+# =
+# MAIN
+# =
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="flood-model", description="Dynamic flood risk pipeline")
+    parser.add_argument("--worker", metavar="ADDRESS",
+                        help=f"run the job in a warm worker (default: ${WORKER_ENV})")
+
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("dummy-data", help="write constant test rainfall and soil rasters")
+    p.set_defaults(func=run_dummy_data)
+
+    p = sub.add_parser("resample", help="resample the static raster to 10 m")
+    p.set_defaults(func=run_resample)
+
+    p = sub.add_parser("rain-fetch", help="download hourly rainfall from Open-Meteo")
+    p.set_defaults(func=run_rain_fetch)
+
+    p = sub.add_parser("rain-raster", help="turn the rainfall CSV into hourly rasters")
+    p.set_defaults(func=run_rain_raster)
+
+    p = sub.add_parser("soil", help="download and normalize ERA5 soil moisture")
+    p.add_argument("--mode", dest="download_mode", choices=["hourly", "batch"],
+                   help="default: soilmoisture.DOWNLOAD_MODE")
+    p.set_defaults(func=run_soil)
+
+    p = sub.add_parser("clip", help="clip wetness rasters to the county boundary")
+    p.set_defaults(func=run_clip)
+
+    p = sub.add_parser("dynamic", help="compute rainfactor and dynamic risk")
+    p.add_argument("--quantize", choices=["float32", "uint8", "uint16"],
+                   help="output dtype (default: dynamic_core.QUANTIZE)")
+    p.add_argument("--accumulate", action=argparse.BooleanOptionalAction, help="use the accumulated rain factor over risk.ACCUMULATION_WINDOWS")
+    p.add_argument("--pipeline", action=argparse.BooleanOptionalAction,
+                   help="overlap reading, computing and writing hours (default: dynamic_core.PIPELINE)")
+    p.add_argument("--memory-mb", type=int,
+                   help="memory budget for --pipeline (default: dynamic_core.PIPELINE_MEMORY_MB)")
+    p.set_defaults(func=run_dynamic)
+
+    p = sub.add_parser("eta", help="compute the ETA map")
+    p.add_argument("--quantize", action=argparse.BooleanOptionalAction,
+                   help="uint8 hours with a NoData value (default: eta_calculation.QUANTIZE)")
+    p.set_defaults(func=run_eta)
+
+    p = sub.add_parser("regions", help="risk, ETA and wetness for several regions")
+    p.add_argument("--region", action="append", metavar="NAME=BOUNDARY")
+    p.add_argument("--quantize", choices=["float32", "uint8", "uint16"],
+                   help="output dtype (default: multi_region.QUANTIZE)")
+    p.add_argument("--quantize-eta", action=argparse.BooleanOptionalAction, help="default: multi_region.QUANTIZE_ETA")
+    p.add_argument("--download-soil", action=argparse.BooleanOptionalAction, help="default: multi_region.DOWNLOAD_SOIL")
+    p.add_argument("--accumulate", action=argparse.BooleanOptionalAction, help="use the accumulated rain factor over risk.ACCUMULATION_WINDOWS")
+    p.set_defaults(func=run_regions)
+
+    p = sub.add_parser("check-eta", help="print the ETA values")
+    p.set_defaults(func=run_check_eta)
+
+    p = sub.add_parser("check-progression", help="print the max risk per hour")
+    p.set_defaults(func=run_check_progression)
+
+    p = sub.add_parser("worker", help="start a warm worker")
+    p.add_argument("--address", default=DEFAULT_ADDRESS,
+                   help=f"socket path, or port on the TCP fallback (default: {DEFAULT_ADDRESS})")
+    p.set_defaults(func=run_worker)
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser().parse_args(argv)
+
+    address = args.worker or os.environ.get(WORKER_ENV)
+
+    if address and args.func is not run_worker:
+        try:
+            return submit(address, argv)
+        except OSError as e:
+            print(f"Worker at {address} not reachable ({e}), running locally", file=sys.stderr)
+
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import os
+import sys
+import numpy as np
+import rasterio
+from rasterio.errors import WindowError
+from rasterio.features import geometry_mask
+from rasterio.windows import Window, union, transform as window_transform
+from shapely.ops import unary_union
+
+from quantize import write_eta_raster, write_unit_raster
+from raster_cache import read_cached
+from risk import RainAccumulator, clean_static, compute_dynamic_risk, compute_rain_factor, rain_file_time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Clipping helpers live with the soil moisture pipeline
+sys.path.insert(0, os.path.join(BASE_DIR, "scripts", "soil_moisture_pipeline"))
+from cliphudsonboundary import clip_rasters_to_regions, load_boundaries, region_window  # noqa: E402
+
+STATIC = "data_static/static_fv_10m.tif"
+WETNESS = "data_dynamic_raw/soil/wf_20260206.tif"
+
+# Region name -> boundary file
+REGIONS = {
+    "hudson": "hudson_county.gpkg",
+}
+
+THRESHOLD = 0.4
+
+# Same meaning as in dynamic_core / eta_calculation
+QUANTIZE = None
+QUANTIZE_ETA = False
+ACCUMULATE = False
+
+# Download ERA5 soil moisture once for the union of all regions before clipping
+DOWNLOAD_SOIL = False
+
+rain_folder = "data_dynamic_raw/rainfall"
+OUTPUT_ROOT = "data_dynamic_processed/regions"
+
+
+def valid_region_name(name):
+    """Region names become directories under OUTPUT_ROOT, so they must stay plain names"""
+    return bool(name) and name != "." and ".." not in name and "/" not in name and "\\" not in name
+
+
+def prepare_regions(boundaries, transform, width, height):
+    """
+    Pixel window and inside-mask of every region on the static grid.
+
+    Windows are also returned relative to the union window, which is the only
+    area that gets read and computed. Regions outside the raster are skipped;
+    if none overlap, the union window is None.
+    """
+    full = Window(0, 0, width, height)
+
+    windows = {}
+    for name, shapes in boundaries.items():
+        try:
+            windows[name] = region_window(shapes, transform, full)
+        except WindowError:
+            print(f"WARNING: {name} does not overlap {STATIC}, skipping it")
+
+    if not windows:
+        return None, {}
+
+    area = union(*windows.values())
+
+    regions = {}
+    for name, window in windows.items():
+        inside = geometry_mask(
+            boundaries[name],
+            out_shape=(window.height, window.width),
+            transform=window_transform(window, transform),
+            invert=True,
+            all_touched=True
+        )
+        local = Window(window.col_off - area.col_off, window.row_off - area.row_off,
+                       window.width, window.height)
+        regions[name] = {"window": window, "local": local, "inside": inside}
+
+    return area, regions
+
+
+def region_meta(meta, window, transform):
+    """Raster metadata for one region's clip of the static grid"""
+    out = meta.copy()
+    out.update(height=window.height, width=window.width,
+               transform=window_transform(window, transform))
+    return out
+
+
+def fan_out(data, region):
+    """Cut one region out of a union-window array, NaN outside its boundary"""
+    clip = data[region["local"].toslices()]
+    return np.where(region["inside"], clip, np.nan)
+
+
+def regions_bbox(boundary_files):
+    """Lon/lat bbox covering all region boundaries, for the soil moisture download"""
+    boundaries = load_boundaries(boundary_files, "EPSG:4326")
+    bounds = np.array([unary_union(shapes).bounds for shapes in boundaries.values()])
+
+    return {
+        'west': float(bounds[:, 0].min()),
+        'south': float(bounds[:, 1].min()),
+        'east': float(bounds[:, 2].max()),
+        'north': float(bounds[:, 3].max())
+    }
+
+
+def run_wetness(boundary_files, download_soil=False):
+    """Fetch soil moisture once for all regions (optional) and clip it per region"""
+    if download_soil:
+        import soilmoisture
+
+        if not soilmoisture.initialize_ee():
+            print("Cannot initialize Earth Engine, clipping existing rasters only")
+        elif soilmoisture.DOWNLOAD_MODE == "batch":
+            soilmoisture.download_and_process_batch(bbox=regions_bbox(boundary_files))
+        else:
+            soilmoisture.download_and_process(bbox=regions_bbox(boundary_files))
+
+    return clip_rasters_to_regions(boundary_files)
+
+
+def run_risk_and_eta(boundary_files, quantize=None, quantize_eta=False, accumulate=False):
+    """Compute rainfactor, dynamic risk and ETA for every region in one pass"""
+    with rasterio.open(STATIC) as src:
+        meta = src.meta.copy()
+
+    transform = meta["transform"]
+    boundaries = load_boundaries(boundary_files, meta["crs"])
+    area, regions = prepare_regions(boundaries, transform, meta["width"], meta["height"])
+
+    if not regions:
+        print(f"ERROR: none of the regions ({', '.join(boundary_files)}) overlap {STATIC}")
+        sys.exit(1)
+
+    # Shared inputs, once for all regions: a one-shot run reads only the union
+    # window from disk, the warm worker slices it from its cached full rasters
+    static_fv = clean_static(read_cached(STATIC, window=area)[0])
+    wetness, _ = read_cached(WETNESS, window=area)
+
+    metas = {name: region_meta(meta, region["window"], transform) for name, region in regions.items()}
+
+    for name in regions:
+        os.makedirs(f"{OUTPUT_ROOT}/{name}/rainfactor", exist_ok=True)
+        os.makedirs(f"{OUTPUT_ROOT}/{name}/dynamic_risk", exist_ok=True)
+
+    eta_map = np.zeros(static_fv.shape, dtype=np.uint8)
+    reached = np.zeros(static_fv.shape, dtype=bool)
+
+    # One accumulator over the union window serves every region
+    accumulator = RainAccumulator() if accumulate else None
+
+    # Hour order matters for the ETA and the accumulated factor
+    for file in sorted(os.listdir(rain_folder)):
+        if not file.endswith(".tif"):
+            continue
+
+        hour = file.split("_")[-1].replace(".tif", "")
+
+        with rasterio.open(os.path.join(rain_folder, file)) as src:
+            rainfall = src.read(1, window=area)
+
+        # Computed once over the union, overlapping regions share the result
+        if accumulator is not None:
+            rain_factor = accumulator.update(rainfall, rain_file_time(file))
+        else:
+            rain_factor = compute_rain_factor(rainfall)
+        dynamic_risk = compute_dynamic_risk(static_fv, rain_factor, wetness)
+
+        mask = (dynamic_risk >= THRESHOLD) & ~reached
+        eta_map[mask] = int(hour)
+        reached |= mask
+
+        for name, region in regions.items():
+            write_unit_raster(f"{OUTPUT_ROOT}/{name}/rainfactor/rf_{hour}.tif",
+                              fan_out(rain_factor, region), metas[name], quantize)
+            write_unit_raster(f"{OUTPUT_ROOT}/{name}/dynamic_risk/dyn_{hour}.tif",
+                              fan_out(dynamic_risk, region), metas[name], quantize)
+
+        print(f"Processed hour {hour} for {len(regions)} regions")
+
+    for name, region in regions.items():
+        local = region["local"].toslices()
+        write_eta_raster(f"{OUTPUT_ROOT}/{name}/eta_map.tif", eta_map[local],
+                         reached[local] & region["inside"], metas[name], quantize_eta)
+
+    return list(regions)
+
+
+def main(regions=None, quantize=None, quantize_eta=None, download_soil=None, accumulate=None):
+    # Unset options fall back to the module settings, read at call time
+    regions = REGIONS if regions is None else regions
+    quantize = QUANTIZE if quantize is None else quantize
+    quantize_eta = QUANTIZE_ETA if quantize_eta is None else quantize_eta
+    download_soil = DOWNLOAD_SOIL if download_soil is None else download_soil
+    accumulate = ACCUMULATE if accumulate is None else accumulate
+
+    os.chdir(BASE_DIR)
+
+    for name in regions:
+        if not valid_region_name(name):
+            raise ValueError(f"Invalid region name: {name!r}")
+
+    names = run_risk_and_eta(regions, quantize, quantize_eta, accumulate)
+    print(f"Risk and ETA computed for: {', '.join(names)}")
+
+    clipped = run_wetness(regions, download_soil)
+    for name, files in clipped.items():
+        print(f"Wetness clipped for {name}: {len(files)} rasters")
+
+    print("Multi-region computation completed.")
+
+
+if __name__ == "__main__":
+    main()
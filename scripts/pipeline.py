@@ -0,0 +1,65 @@
+"""
+Overlapped read -> compute -> write over a sequence of hours.
+
+A reader thread prefetches the next hours while the calling thread computes
+the current one, and writer threads encode and flush earlier hours. GDAL
+and most numpy operations release the GIL, so per-hour time approaches
+max(read, compute, write) instead of their sum.
+
+Memory stays bounded: at most `depth` hours are prefetched and at most
+`depth` hours wait to be written, on top of the hour being computed.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def pipeline_depth(height, width, memory_mb, rasters_per_hour=3, itemsize=4):
+    """
+    Hours allowed in flight per stage for a memory budget.
+
+    An hour is counted as rasters_per_hour arrays of height x width (rainfall,
+    rainfactor and risk by default). Both the prefetch and the write queue
+    get this depth, so the budget is split between them.
+    """
+    hour_bytes = height * width * itemsize * rasters_per_hour
+    return max(1, int(memory_mb * 2**20 // (2 * hour_bytes)))
+
+
+def run_pipelined(items, read, compute, write, depth=2, writers=2):
+    """
+    Run write(item, compute(item, read(item))) for every item, overlapped.
+
+    compute runs in the calling thread, in item order, so it may keep state
+    between items. read runs in one background thread, in item order. write
+    runs in `writers` threads and must not depend on other items' writes.
+    The first exception from any stage is raised here.
+    """
+    items = list(items)
+
+    with ThreadPoolExecutor(1) as read_pool, ThreadPoolExecutor(writers) as write_pool:
+        reads = deque(read_pool.submit(read, item) for item in items[:depth])
+        writes = deque()
+
+        try:
+            for i, item in enumerate(items):
+                data = reads.popleft().result()
+
+                # Keep the prefetch queue full while this hour is computed
+                if i + depth < len(items):
+                    reads.append(read_pool.submit(read, items[i + depth]))
+
+                result = compute(item, data)
+
+                # Bound the write backlog before queueing another hour
+                if len(writes) >= depth:
+                    writes.popleft().result()
+
+                writes.append(write_pool.submit(write, item, result))
+
+            while writes:
+                writes.popleft().result()
+        except BaseException:
+            for future in list(reads) + list(writes):
+                future.cancel()
+            raise
@@ -0,0 +1,135 @@
+"""
+Quantized storage for unit-range rasters (dynamic risk, rainfactor) and ETA.
+
+Risk and rainfactor values live in [0, 1], so they can be stored as
+unsigned integer codes with a GDAL scale/offset instead of float32:
+
+    value = code * scale + offset
+
+The top code of each dtype is reserved for NoData, the remaining codes are
+spread evenly over [0, 1]. Values are rounded to the nearest code, so the
+absolute error is bounded by scale / 2:
+
+    uint8   scale = 1/254    max error ~ 0.0020   (4x smaller than float32)
+    uint16  scale = 1/65534  max error ~ 0.0000076 (2x smaller than float32)
+
+Values outside [0, 1] are clipped before quantizing. NaN becomes NoData.
+
+ETA maps hold whole hours, so they are stored as uint8 with ETA_NODATA
+marking cells that never reach the threshold (hour 0 stays a real hour).
+"""
+
+import numpy as np
+import rasterio
+
+# NoData code for each quantized dtype; valid codes are 0 .. nodata - 1
+QUANT_DTYPES = {
+    "uint8": 255,
+    "uint16": 65535,
+}
+
+ETA_DTYPE = "uint8"
+ETA_NODATA = 255
+
+
+def unit_scale(dtype):
+    """Scale that maps codes 0 .. nodata - 1 onto [0, 1]"""
+    return 1.0 / (QUANT_DTYPES[dtype] - 1)
+
+
+def max_error(dtype):
+    """Worst-case absolute error of a quantized [0, 1] value"""
+    return unit_scale(dtype) / 2
+
+
+def quantize_unit(data, dtype):
+    """Convert [0, 1] floats to integer codes, NaN -> NoData"""
+    nodata = QUANT_DTYPES[dtype]
+    valid = np.isfinite(data)
+
+    codes = np.full(data.shape, nodata, dtype=dtype)
+    codes[valid] = np.rint(np.clip(data[valid], 0, 1) / unit_scale(dtype))
+    return codes
+
+
+def dequantize(codes, scale, offset, nodata):
+    """Convert integer codes back to float32, NoData -> NaN"""
+    data = codes.astype(np.float32) * np.float32(scale) + np.float32(offset)
+    if nodata is not None:
+        data[codes == nodata] = np.nan
+    return data
+
+
+def write_unit_raster(path, data, meta, quantize=None):
+    """Write a [0, 1] raster as float32 (quantize None or "float32") or as "uint8"/"uint16" codes"""
+    out_meta = meta.copy()
+
+    if quantize in (None, "float32"):
+        out_meta.update(dtype=rasterio.float32)
+        with rasterio.open(path, "w", **out_meta) as dst:
+            dst.write(data.astype(np.float32), 1)
+        return
+
+    if quantize not in QUANT_DTYPES:
+        raise ValueError(f"Unsupported quantize dtype: {quantize}")
+
+    out_meta.update(dtype=quantize, nodata=QUANT_DTYPES[quantize])
+    with rasterio.open(path, "w", **out_meta) as dst:
+        dst.write(quantize_unit(data, quantize), 1)
+        dst.scales = (unit_scale(quantize),)
+        dst.offsets = (0.0,)
+
+
+def read_unit_raster(path, dequantize_values=True, window=None):
+    """
+    Read band 1 of a risk/rainfactor raster.
+
+    Quantized files are dequantized to float32 unless dequantize_values is
+    False, in which case the raw integer codes are returned untouched.
+    Float files are returned as stored.
+    """
+    with rasterio.open(path) as src:
+        data = src.read(1, window=window)
+        if src.dtypes[0] not in QUANT_DTYPES or not dequantize_values:
+            return data
+        scale, offset, nodata = src.scales[0], src.offsets[0], src.nodata
+
+    return dequantize(data, scale, offset, nodata)
+
+
+def write_eta_raster(path, eta_hours, reached, meta, quantize=False):
+    """
+    Write an ETA map.
+
+    Default keeps the float32 layout with 0 for cells that never reach the
+    threshold. With quantize=True the map is uint8 and those cells are
+    ETA_NODATA.
+    """
+    out_meta = meta.copy()
+
+    # meta may come from a quantized risk raster; its NoData code means nothing here
+    if out_meta.get("dtype") in QUANT_DTYPES:
+        out_meta.update(nodata=None)
+
+    if not quantize:
+        out_meta.update(dtype=rasterio.float32)
+        eta = np.where(reached, eta_hours, 0).astype(np.float32)
+    else:
+        out_meta.update(dtype=ETA_DTYPE, nodata=ETA_NODATA)
+        eta = np.where(reached, eta_hours, ETA_NODATA).astype(ETA_DTYPE)
+
+    with rasterio.open(path, "w", **out_meta) as dst:
+        dst.write(eta, 1)
+
+
+def read_eta_raster(path):
+    """Read an ETA map as float32 hours with NaN for NoData cells"""
+    with rasterio.open(path) as src:
+        data = src.read(1)
+        nodata = src.nodata
+        dtype = src.dtypes[0]
+
+    if dtype != ETA_DTYPE:
+        return data
+
+    return dequantize(data, 1.0, 0.0, nodata)
@@ -4,36 +4,42 @@ import rasterio
 import os
 from rasterio.transform import from_bounds
 folder = r"C:\Users\abtah\PycharmProjects\FlashFlooding\data_dynamic_raw\rainfall"
+STATIC_FV = r"C:\Users\abtah\PycharmProjects\FlashFlooding\data_static\static_flood_vulnerability.tif"
 
-for f in os.listdir(folder):
-    if f.endswith(".tif"):
-        os.remove(os.path.join(folder, f))
 
-df = pd.read_csv(r"C:\Users\abtah\PycharmProjects\FlashFlooding\data_dynamic_raw\rainfall\rain_hourly.csv")
-df["time"] = pd.to_datetime(df["time"])
-STATIC_FV = r"C:\Users\abtah\PycharmProjects\FlashFlooding\data_static\static_flood_vulnerability.tif"
+def main():
+    for f in os.listdir(folder):
+        if f.endswith(".tif"):
+            os.remove(os.path.join(folder, f))
+
+    df = pd.read_csv(r"C:\Users\abtah\PycharmProjects\FlashFlooding\data_dynamic_raw\rainfall\rain_hourly.csv")
+    df["time"] = pd.to_datetime(df["time"])
+
+    with rasterio.open(STATIC_FV) as ref:
+        profile = ref.profile
+        bounds = ref.bounds
+        width = ref.width
+        height = ref.height
+
+    for _, row in df.iterrows():
+        rain = row["precip_mm"]
+        timestamp = row["time"].strftime("%Y%m%d_%H")
 
-with rasterio.open(STATIC_FV) as ref:
-    profile = ref.profile
-    bounds = ref.bounds
-    width = ref.width
-    height = ref.height
+        data = np.full((height, width), rain, dtype="float32")
 
-for _, row in df.iterrows():
-    rain = row["precip_mm"]
-    timestamp = row["time"].strftime("%Y%m%d_%H")
+        profile.update(
+            dtype="float32",
+            count=1,
+            compress="lzw"
+        )
 
-    data = np.full((height, width), rain, dtype="float32")
+        out_path = fr"C:\Users\abtah\PycharmProjects\FlashFlooding\data_dynamic_raw\rainfall\rain_{timestamp}.tif"
 
-    profile.update(
-        dtype="float32",
-        count=1,
-        compress="lzw"
-    )
+        with rasterio.open(out_path, "w", **profile) as dst:
+            dst.write(data, 1)
 
-    out_path = fr"C:\Users\abtah\PycharmProjects\FlashFlooding\data_dynamic_raw\rainfall\rain_{timestamp}.tif"
+        print(f"Saved {out_path}")
 
-    with rasterio.open(out_path, "w", **profile) as dst:
-        dst.write(data, 1)
 
-    print(f"Saved {out_path}")
+if __name__ == "__main__":
+    main()
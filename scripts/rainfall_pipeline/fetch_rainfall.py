@@ -14,13 +14,19 @@ params = {
     "timezone": "UTC"
 }
 
-r = requests.get(url, params=params)
-data = r.json()
 
-df = pd.DataFrame({
-    "time": data["hourly"]["time"],
-    "precip_mm": data["hourly"]["precipitation"]
-})
+def main():
+    r = requests.get(url, params=params)
+    data = r.json()
 
-df["time"] = pd.to_datetime(df["time"])
-df.to_csv(r"C:\Users\abtah\PycharmProjects\FlashFlooding\data_dynamic_raw\rainfall\rain_hourly.csv", index=False)
+    df = pd.DataFrame({
+        "time": data["hourly"]["time"],
+        "precip_mm": data["hourly"]["precipitation"]
+    })
+
+    df["time"] = pd.to_datetime(df["time"])
+    df.to_csv(r"C:\Users\abtah\PycharmProjects\FlashFlooding\data_dynamic_raw\rainfall\rain_hourly.csv", index=False)
+
+
+if __name__ == "__main__":
+    main()
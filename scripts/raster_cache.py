@@ -0,0 +1,57 @@
+"""
+Cache for rasters that every run reads unchanged (static vulnerability,
+soil wetness), used by the warm worker in flood_cli.py.
+
+One-shot runs never enable it: read_cached then simply reads the requested
+window from disk. Once the worker calls enable_cache(), one full copy per
+path stays in memory and windows are sliced from it.
+"""
+
+import os
+
+import rasterio
+
+_enabled = False
+_cache = {}
+
+
+def enable_cache():
+    global _enabled
+    _enabled = True
+
+
+def read_cached(path, window=None):
+    """
+    Band 1 (or a window of it) and metadata of path.
+
+    With the cache enabled, the full raster is kept until the file's mtime
+    changes and windows are views into it, so new windows do not grow the
+    cache. The window must be whole pixels inside the raster. Cached arrays
+    are read-only because they are shared between jobs.
+    """
+    if not _enabled:
+        with rasterio.open(path) as src:
+            return src.read(1, window=window), src.meta.copy()
+
+    key = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+
+    hit = _cache.get(key)
+    if hit is None or hit[0] != mtime:
+        with rasterio.open(path) as src:
+            data = src.read(1)
+            meta = src.meta.copy()
+
+        data.flags.writeable = False
+        hit = _cache[key] = (mtime, data, meta)
+
+    _, data, meta = hit
+
+    if window is not None:
+        data = data[window.toslices()]
+
+    return data, meta.copy()
+
+
+def clear_cache():
+    _cache.clear()
@@ -0,0 +1,121 @@
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+
+MAX_RAIN = 50.0  # normalization constant
+
+# Accumulation window (hours) -> rainfall (mm) over that window that saturates
+# the rain factor. The 1 h entry matches MAX_RAIN.
+ACCUMULATION_WINDOWS = {
+    1: MAX_RAIN,
+    3: 75.0,
+    6: 100.0,
+}
+
+# Dynamic risk weights
+RAIN_WEIGHT = 0.6
+WETNESS_WEIGHT = 0.4
+
+
+def clean_static(static_fv):
+    """Replace the static raster's NoData fill with NaN"""
+    return np.where(static_fv < -1e30, np.nan, static_fv)
+
+
+def compute_rain_factor(rainfall):
+    """Normalize hourly rainfall (mm) to [0, 1]"""
+    return np.clip(rainfall / MAX_RAIN, 0, 1)
+
+
+def compute_dynamic_risk(static_fv, rain_factor, wetness):
+    """Combine static vulnerability with rain and soil wetness"""
+    return static_fv * (RAIN_WEIGHT * rain_factor + WETNESS_WEIGHT * wetness)
+
+
+def rain_file_time(file):
+    """Hour of a rainfall raster from its name, e.g. rain_20260206_12.tif"""
+    stem = file.rsplit(".", 1)[0]
+    try:
+        date, hour = stem.split("_")[-2:]
+        return datetime.strptime(date + hour, "%Y%m%d%H")
+    except ValueError:
+        raise ValueError(f"Cannot read YYYYMMDD_HH from rainfall file name: {file}") from None
+
+
+class RainAccumulator:
+    """
+    Accumulated-rainfall factor over several rolling windows.
+
+    Every window keeps a running sum: each hour the new raster is added and
+    the one leaving the window is subtracted, so the cost per hour depends on
+    the number of windows, not their length. Only the last max(window) hourly
+    rasters are kept in memory; nothing is re-read from disk.
+
+    The factor is the largest of sum / saturation over all windows, clipped
+    to [0, 1]. NaN counts as 0 mm. When update() gets each hour's time, hours
+    missing in between count as 0 mm, so a window never joins hours that are
+    far apart; without times, hours are taken as consecutive.
+    """
+
+    def __init__(self, windows=ACCUMULATION_WINDOWS):
+        self.windows = dict(windows)
+        self.history = deque(maxlen=max(self.windows))
+        self.sums = {}
+        self.last_time = None
+
+    def update(self, rainfall, time=None):
+        """
+        Add the next hour and return the combined rain factor.
+
+        time is the hour's datetime. An hour at or before the previous one
+        raises ValueError.
+        """
+        rain = np.nan_to_num(rainfall, nan=0.0).astype(np.float32)
+
+        if not self.sums:
+            # float64 sums keep add/subtract round-off negligible over long runs
+            self.sums = {hours: np.zeros(rain.shape) for hours in self.windows}
+
+        if time is not None:
+            if self.last_time is not None:
+                self.skip_hours(time, rain.shape)
+            self.last_time = time
+
+        self.push(rain)
+
+        return self.factor()
+
+    def skip_hours(self, time, shape):
+        """Feed 0 mm for the hours between the previous update and time"""
+        missing = int((time - self.last_time) / timedelta(hours=1)) - 1
+
+        if missing < 0:
+            raise ValueError(f"Rainfall hours out of order: {time} after {self.last_time}")
+
+        if missing >= self.history.maxlen:
+            # Every window is dry after the gap
+            self.history.clear()
+            for total in self.sums.values():
+                total[:] = 0
+            return
+
+        dry = np.zeros(shape, dtype=np.float32)
+        for _ in range(missing):
+            self.push(dry)
+
+    def push(self, rain):
+        for hours, total in self.sums.items():
+            total += rain
+            if len(self.history) >= hours:
+                total -= self.history[-hours]
+
+        self.history.append(rain)
+
+    def factor(self):
+        factor = None
+        for hours, total in self.sums.items():
+            window_factor = np.clip(total / self.windows[hours], 0, 1)
+            factor = window_factor if factor is None else np.maximum(factor, window_factor)
+
+        return factor.astype(np.float32)
@@ -0,0 +1,131 @@
+"""
+Offline check of soilmoisture.download_and_process_batch.
+
+Earth Engine and the HTTP download are replaced by fakes: the fake download
+returns a 4-band GeoTIFF with a constant value per band. The check counts
+the round trips and verifies the per-hour rasters that come out.
+"""
+
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import rasterio
+from rasterio.io import MemoryFile
+from rasterio.transform import from_bounds
+
+import soilmoisture
+
+HOURS = [0, 1, 2, 3]
+BAND_VALUES = [0.1, 0.2, 0.3, 0.5]  # m³/m³, one constant per hour
+DAY_MIN, DAY_MAX = 0.1, 0.5
+
+calls = {"getInfo": 0, "getDownloadURL": 0, "http_get": 0}
+
+
+# FAKE EARTH ENGINE
+
+class FakeImage:
+    def reduceRegion(self, **kwargs):
+        return "range"
+
+    def getDownloadURL(self, params):
+        calls["getDownloadURL"] += 1
+        return "https://example.invalid/stack.tif"
+
+
+class FakeCollection:
+    def select(self, *args):
+        return self
+
+    def filterDate(self, *args):
+        return self
+
+    def filterBounds(self, *args):
+        return self
+
+    def reduce(self, reducer):
+        return FakeImage()
+
+    def aggregate_array(self, prop):
+        return "times"
+
+    def toBands(self):
+        return FakeImage()
+
+
+class FakeDictionary:
+    def __init__(self, value):
+        self.value = value
+
+    def getInfo(self):
+        calls["getInfo"] += 1
+        day = soilmoisture.TARGET_DATE.replace(tzinfo=timezone.utc)
+        times = [
+            int(datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc).timestamp() * 1000)
+            for hour in HOURS
+        ]
+        band = soilmoisture.SOIL_BAND
+        return {"times": times, "range": {f"{band}_min_min": DAY_MIN, f"{band}_max_max": DAY_MAX}}
+
+
+fake_ee = SimpleNamespace(
+    Geometry=SimpleNamespace(Rectangle=lambda coords: "aoi"),
+    ImageCollection=lambda name: FakeCollection(),
+    Reducer=SimpleNamespace(minMax=lambda: "minMax"),
+    Dictionary=FakeDictionary,
+)
+
+
+# FAKE DOWNLOAD
+
+def fake_stack():
+    """GeoTIFF bytes with one constant band per hour over the Hudson bbox"""
+    bbox = soilmoisture.HUDSON_BBOX
+    height, width = 20, 20
+    transform = from_bounds(bbox['west'], bbox['south'], bbox['east'], bbox['north'], width, height)
+
+    with MemoryFile() as memfile:
+        with memfile.open(driver="GTiff", height=height, width=width, count=len(HOURS),
+                          dtype="float32", crs="EPSG:4326", transform=transform) as dst:
+            for band, value in enumerate(BAND_VALUES, start=1):
+                dst.write(np.full((height, width), value, dtype=np.float32), band)
+        return memfile.read()
+
+
+def fake_get(url, timeout=None):
+    calls["http_get"] += 1
+    return SimpleNamespace(status_code=200, content=fake_stack())
+
+
+# CHECK
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        soilmoisture.OUTPUT_DIR = Path(tmp)
+
+        files = soilmoisture.download_and_process_batch(ee_api=fake_ee, http_get=fake_get)
+
+        assert calls == {"getInfo": 1, "getDownloadURL": 1, "http_get": 1}, calls
+        assert len(files) == len(HOURS), files
+        assert not (Path(tmp) / "temp_stack.tif").exists()
+
+        date_str = soilmoisture.TARGET_DATE.strftime('%Y%m%d')
+
+        for hour, value, path in zip(HOURS, BAND_VALUES, files):
+            assert path.name == f"wf_{date_str}_{hour:02d}.tif", path.name
+
+            with rasterio.open(path) as src:
+                assert src.crs.to_string() == soilmoisture.TARGET_CRS
+                data = src.read(1)
+
+            expected = (value - DAY_MIN) / (DAY_MAX - DAY_MIN)
+            assert np.isclose(data.max(), expected, atol=1e-4), (path.name, data.max(), expected)
+
+    print("Offline batch check passed:", calls)
+
+
+if __name__ == "__main__":
+    main()
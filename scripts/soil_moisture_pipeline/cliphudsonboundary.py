@@ -2,6 +2,9 @@ import geopandas as gpd
 import rasterio
 from rasterio.mask import mask
 from rasterio.features import geometry_mask
+from rasterio.errors import WindowError
+from rasterio.windows import Window, from_bounds, transform as window_transform
+from shapely.ops import unary_union
 import numpy as np
 from pathlib import Path
 import json
@@ -14,7 +17,6 @@ INPUT_DIR = Path("wetness_factor_rasters")
 
 # Output directory (clipped rasters)
 OUTPUT_DIR = Path("wetness_factor_clipped")
-OUTPUT_DIR.mkdir(exist_ok=True)
 
 # Hudson County boundary file
 BOUNDARY_FILE = "hudson_county.gpkg"
@@ -52,6 +54,8 @@ def clip_rasters_to_boundary():
     
     print(f"\nFound {len(input_files)} rasters to clip")
     
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    
     # Reproject boundary to match raster CRS
     with rasterio.open(input_files[0]) as src:
         raster_crs = src.crs
@@ -117,6 +121,115 @@ def clip_rasters_to_boundary():
     
     return output_files
 
+# CLIP RASTERS TO SEVERAL BOUNDARIES
+
+def load_boundaries(boundary_files, crs):
+    """Load each boundary once and reproject it to the raster CRS"""
+    
+    geometries = {}
+    
+    for name, boundary_file in boundary_files.items():
+        gdf = gpd.read_file(boundary_file)
+        
+        if gdf.crs != crs:
+            gdf = gdf.to_crs(crs)
+        
+        geometries[name] = list(gdf.geometry)
+    
+    return geometries
+
+
+def clip_rasters_to_regions(boundary_files, input_dir=INPUT_DIR, output_dir=OUTPUT_DIR):
+    """
+    Clip all wetness factor rasters to several boundaries in one pass.
+    
+    boundary_files maps a region name to its boundary file. Each input raster
+    is read once and every region is cut from that array; the clip window and
+    mask of a region are computed once per raster grid and reused for all hours.
+    Outputs go to output_dir/<region>/<raster name>.
+    """
+    
+    print(f"CLIPPING RASTERS TO {len(boundary_files)} BOUNDARIES")
+    
+    input_files = sorted(Path(input_dir).glob("wf_*.tif"))
+    
+    if not input_files:
+        print(f"\nERROR: No wetness factor rasters found in {input_dir}")
+        return {}
+    
+    with rasterio.open(input_files[0]) as src:
+        geometries = load_boundaries(boundary_files, src.crs)
+    
+    output_files = {name: [] for name in geometries}
+    clip_cache = {}
+    
+    for input_file in input_files:
+        with rasterio.open(input_file) as src:
+            data = src.read(1)
+            out_meta = src.meta.copy()
+            grid = (src.transform, src.width, src.height)
+        
+        # Windows and masks only depend on the grid, not on the hour
+        if grid not in clip_cache:
+            clip_cache[grid] = {}
+            full = Window(0, 0, grid[1], grid[2])
+            
+            for name, shapes in geometries.items():
+                try:
+                    window = region_window(shapes, grid[0], full)
+                except WindowError:
+                    print(f"   WARNING: {name} does not overlap {input_file.name}")
+                    continue
+                
+                inside = geometry_mask(
+                    shapes,
+                    out_shape=(window.height, window.width),
+                    transform=window_transform(window, grid[0]),
+                    invert=True,
+                    all_touched=True
+                )
+                clip_cache[grid][name] = (window, inside)
+        
+        for name, (window, inside) in clip_cache[grid].items():
+            clipped = np.where(inside, data[window.toslices()], 0).astype(data.dtype)
+            
+            region_meta = out_meta.copy()
+            region_meta.update({
+                "driver": "GTiff",
+                "height": window.height,
+                "width": window.width,
+                "transform": window_transform(window, grid[0]),
+                "nodata": 0,
+                "compress": "lzw"
+            })
+            
+            region_dir = Path(output_dir) / name
+            region_dir.mkdir(parents=True, exist_ok=True)
+            output_file = region_dir / input_file.name
+            
+            with rasterio.open(output_file, "w", **region_meta) as dest:
+                dest.write(clipped, 1)
+            
+            output_files[name].append(output_file)
+        
+        print(f"   {input_file.name} -> {len(clip_cache[grid])} regions")
+    
+    return output_files
+
+
+def region_window(shapes, transform, full):
+    """Pixel window covering the shapes, snapped outwards and limited to the raster"""
+    
+    bounds = unary_union(shapes).bounds
+    window = from_bounds(*bounds, transform=transform)
+    
+    col_off = int(np.floor(window.col_off))
+    row_off = int(np.floor(window.row_off))
+    col_end = int(np.ceil(window.col_off + window.width))
+    row_end = int(np.ceil(window.row_off + window.height))
+    
+    return Window(col_off, row_off, col_end - col_off, row_end - row_off).intersection(full)
+
 # VERIFY
 
 def verify_clipped_rasters(files):
@@ -1,11 +1,10 @@
-import ee
 import requests
 import numpy as np
 import rasterio
 from rasterio.transform import from_bounds
 from rasterio.warp import reproject, Resampling, calculate_default_transform
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import time
 
 
@@ -25,11 +24,18 @@ TARGET_DATE = datetime.now() - timedelta(days=7)
 
 # Output directory
 OUTPUT_DIR = Path("wetness_factor_rasters")
-OUTPUT_DIR.mkdir(exist_ok=True)
 
 # Target CRS
 TARGET_CRS = "EPSG:26918"  # NAD83 UTM Zone 18N
 
+# Download mode
+#   "hourly": one getDownloadURL + download per hour, min/max on the client
+#   "batch":  min/max reduced on the server, all hours fetched as one
+#             multi-band image and split locally (~3 round trips per day)
+DOWNLOAD_MODE = "hourly"
+
+SOIL_BAND = 'volumetric_soil_water_layer_1'
+
 # =
 # INITIALIZE
 # =
@@ -37,6 +43,9 @@ TARGET_CRS = "EPSG:26918"  # NAD83 UTM Zone 18N
 def initialize_ee():
     """Initialize Earth Engine with project"""
     
+    # Imported here so the module loads without earthengine-api
+    import ee
+    
     print("=" * 70)
     print("AUTOMATED EARTH ENGINE DOWNLOAD")
     print("=" * 70)
@@ -72,23 +81,82 @@ def initialize_ee():
     
     return False
 
+# =
+# REPROJECT + NORMALIZE
+# =
+
+def write_wetness(src, data, hour, global_min, global_max):
+    """Reproject one hour of soil moisture to TARGET_CRS, normalize and save it"""
+    
+    # Calculate transform
+    transform, width, height = calculate_default_transform(
+        src.crs,
+        TARGET_CRS,
+        src.width,
+        src.height,
+        *src.bounds
+    )
+    
+    # Create output array
+    reprojected = np.zeros((height, width), dtype=np.float32)
+    
+    # Reproject
+    reproject(
+        source=data,
+        destination=reprojected,
+        src_transform=src.transform,
+        src_crs=src.crs,
+        dst_transform=transform,
+        dst_crs=TARGET_CRS,
+        resampling=Resampling.bilinear
+    )
+    
+    # Normalize
+    wetness = (reprojected - global_min) / (global_max - global_min)
+    wetness = np.clip(wetness, 0, 1)
+    
+    # Output file
+    date_str = TARGET_DATE.strftime('%Y%m%d')
+    output_file = OUTPUT_DIR / f"wf_{date_str}_{hour:02d}.tif"
+    
+    # Write final raster
+    with rasterio.open(
+        output_file,
+        'w',
+        driver='GTiff',
+        height=height,
+        width=width,
+        count=1,
+        dtype=rasterio.float32,
+        crs=TARGET_CRS,
+        transform=transform,
+        compress='lzw'
+    ) as dst:
+        dst.write(wetness.astype(rasterio.float32), 1)
+    
+    return output_file, wetness
+
 # =
 # DOWNLOAD DIRECTLY
 # =
 
-def download_and_process():
-    """Download soil moisture and process in one go"""
+def download_and_process(bbox=HUDSON_BBOX):
+    """Download soil moisture for bbox and process in one go"""
+    
+    import ee
     
     print(f"\n Date: {TARGET_DATE.date()}")
-    print(f" Area: Hudson County, NJ")
+    print(f" Area: {bbox['west']}, {bbox['south']} - {bbox['east']}, {bbox['north']}")
     print(f" Target CRS: {TARGET_CRS}")
     
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    
     # Define area
     aoi = ee.Geometry.Rectangle([
-        HUDSON_BBOX['west'],
-        HUDSON_BBOX['south'],
-        HUDSON_BBOX['east'],
-        HUDSON_BBOX['north']
+        bbox['west'],
+        bbox['south'],
+        bbox['east'],
+        bbox['north']
     ])
     
     # Load dataset
@@ -177,54 +245,9 @@ def download_and_process():
         
         # Read and reproject
         with rasterio.open(temp_file) as src:
-            # Calculate transform
-            transform, width, height = calculate_default_transform(
-                src.crs,
-                TARGET_CRS,
-                src.width,
-                src.height,
-                *src.bounds
-            )
-            
-            # Read data
-            data = src.read(1)
-            
-            # Create output array
-            reprojected = np.zeros((height, width), dtype=np.float32)
-            
-            # Reproject
-            reproject(
-                source=data,
-                destination=reprojected,
-                src_transform=src.transform,
-                src_crs=src.crs,
-                dst_transform=transform,
-                dst_crs=TARGET_CRS,
-                resampling=Resampling.bilinear
+            output_file, wetness = write_wetness(
+                src, src.read(1), hour, global_min, global_max
             )
-            
-            # Normalize
-            wetness = (reprojected - global_min) / (global_max - global_min)
-            wetness = np.clip(wetness, 0, 1)
-            
-            # Output file
-            date_str = TARGET_DATE.strftime('%Y%m%d')
-            output_file = OUTPUT_DIR / f"wf_{date_str}_{hour:02d}.tif"
-            
-            # Write final raster
-            with rasterio.open(
-                output_file,
-                'w',
-                driver='GTiff',
-                height=height,
-                width=width,
-                count=1,
-                dtype=rasterio.float32,
-                crs=TARGET_CRS,
-                transform=transform,
-                compress='lzw'
-            ) as dst:
-                dst.write(wetness.astype(rasterio.float32), 1)
         
         # Clean up temp file
         temp_file.unlink()
@@ -234,6 +257,114 @@ def download_and_process():
     
     return output_files
 
+# =
+# DOWNLOAD IN ONE REQUEST
+# =
+
+def download_and_process_batch(bbox=HUDSON_BBOX, ee_api=None, http_get=requests.get):
+    """
+    Download a whole day as one multi-band image and process it locally.
+    
+    The normalization range is reduced on the server and fetched together
+    with the hour timestamps in a single getInfo call. ee_api and http_get
+    can be swapped for fakes to run this offline (see check_batch_offline.py).
+    """
+    
+    if ee_api is None:
+        import ee as ee_api
+    
+    print(f"\n Date: {TARGET_DATE.date()}")
+    print(f" Area: {bbox['west']}, {bbox['south']} - {bbox['east']}, {bbox['north']}")
+    print(f" Target CRS: {TARGET_CRS}")
+    print(" Mode: batch (server-side min/max, single download)")
+    
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    
+    # Define area
+    aoi = ee_api.Geometry.Rectangle([
+        bbox['west'],
+        bbox['south'],
+        bbox['east'],
+        bbox['north']
+    ])
+    
+    # Filter
+    start_date = TARGET_DATE.strftime('%Y-%m-%d')
+    end_date = (TARGET_DATE + timedelta(days=1)).strftime('%Y-%m-%d')
+    
+    soil_collection = ee_api.ImageCollection('ECMWF/ERA5_LAND/HOURLY') \
+                            .select(SOIL_BAND) \
+                            .filterDate(start_date, end_date) \
+                            .filterBounds(aoi)
+    
+    # Phase 1: Timestamps and min/max over AOI and day, one round trip
+    print("\n   Phase 1: Reducing normalization range on the server...")
+    
+    day_range = soil_collection.reduce(ee_api.Reducer.minMax()).reduceRegion(
+        reducer=ee_api.Reducer.minMax(),
+        geometry=aoi,
+        scale=1000,
+        bestEffort=True
+    )
+    
+    info = ee_api.Dictionary({
+        'times': soil_collection.aggregate_array('system:time_start'),
+        'range': day_range
+    }).getInfo()
+    
+    times = info['times']
+    
+    if not times:
+        print(" No data found!")
+        return []
+    
+    global_min = info['range'][f'{SOIL_BAND}_min_min']
+    global_max = info['range'][f'{SOIL_BAND}_max_max']
+    print(f"   Found {len(times)} hourly images")
+    print(f"   Range: {global_min:.4f} - {global_max:.4f} m³/m³")
+    
+    # Phase 2: All hours stacked as bands, one download
+    print("\n   Phase 2: Downloading all hours as one multi-band image...")
+    
+    url = soil_collection.toBands().getDownloadURL({
+        'scale': 1000,  # ~1km resolution
+        'crs': 'EPSG:4326',
+        'region': aoi,
+        'format': 'GEO_TIFF'
+    })
+    
+    response = http_get(url, timeout=300)
+    
+    if response.status_code != 200:
+        print(f"   Failed: HTTP {response.status_code}")
+        return []
+    
+    temp_file = OUTPUT_DIR / "temp_stack.tif"
+    with open(temp_file, 'wb') as f:
+        f.write(response.content)
+    
+    # Phase 3: Split bands locally (band order follows the collection order)
+    print("\n   Phase 3: Reprojecting and normalizing...")
+    
+    output_files = []
+    
+    with rasterio.open(temp_file) as src:
+        for band, time_start in enumerate(times, start=1):
+            hour = datetime.fromtimestamp(time_start / 1000, tz=timezone.utc).hour
+            print(f"   Hour {hour:02d}:00 - processing...", end='')
+            
+            output_file, wetness = write_wetness(
+                src, src.read(band), hour, global_min, global_max
+            )
+            
+            output_files.append(output_file)
+            print(f"  Range: {wetness.min():.3f} - {wetness.max():.3f}")
+    
+    # Clean up temp file
+    temp_file.unlink()
+    
+    return output_files
+
 # =
 # VERIFY
 # =
@@ -259,9 +390,12 @@ def verify_outputs(files):
 # MAIN
 # =
 
-def main():
+def main(download_mode=None):
     """Main execution"""
     
+    # Unset mode falls back to DOWNLOAD_MODE, read at call time
+    download_mode = DOWNLOAD_MODE if download_mode is None else download_mode
+    
     # Initialize
     if not initialize_ee():
         print("\n Cannot initialize Earth Engine")
@@ -269,7 +403,10 @@ def main():
     
     try:
         # Download and process
-        files = download_and_process()
+        if download_mode == "batch":
+            files = download_and_process_batch()
+        else:
+            files = download_and_process()
         
         if not files:
             print("\n No files created")